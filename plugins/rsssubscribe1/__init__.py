@@ -1,10 +1,12 @@
 import datetime
 import re
-import traceback
 import urllib.parse
+from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
 from threading import Lock
-from typing import Optional, Any, List, Dict, Tuple
+from typing import Optional, Any, List, Dict, Tuple, Iterator, Deque
 
 import pytz
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -24,6 +26,304 @@ from app.schemas.types import SystemConfigKey, MediaType
 
 lock = Lock()
 
+# 详情页展示用的历史记录字段
+HistoryRec = namedtuple("HistoryRec", "title poster type time")
+
+# 插件配置页面，内容固定不变，只构建一次
+_FORM_SCHEMA = [
+    {
+        'component': 'VForm',
+        'content': [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'enabled',
+                                    'label': '启用插件',
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'notify',
+                                    'label': '发送通知',
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'onlyonce',
+                                    'label': '立即运行一次',
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'cron',
+                                    'label': '执行周期',
+                                    'placeholder': '5位cron表达式，留空自动'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VSelect',
+                                'props': {
+                                    'model': 'action',
+                                    'label': '动作',
+                                    'items': [
+                                        {'title': '订阅', 'value': 'subscribe'},
+                                        {'title': '下载', 'value': 'download'}
+                                    ]
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextarea',
+                                'props': {
+                                    'model': 'address',
+                                    'label': 'RSS地址',
+                                    'rows': 3,
+                                    'placeholder': '每行一个RSS地址'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'include',
+                                    'label': '包含',
+                                    'placeholder': '支持正则表达式'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 6
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'exclude',
+                                    'label': '排除',
+                                    'placeholder': '支持正则表达式'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 8
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'save_path',
+                                    'label': '保存目录',
+                                    'placeholder': '下载时有效，留空自动'
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VTextField',
+                                'props': {
+                                    'model': 'history_max',
+                                    'label': '历史记录上限',
+                                    'placeholder': '详情页保留最近的记录条数，留空不限制'
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'proxy',
+                                    'label': '使用代理服务器',
+                                }
+                            }
+                        ]
+                    }, {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4,
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'filter',
+                                    'label': '使用过滤规则',
+                                }
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'clear',
+                                    'label': '清理历史记录',
+                                }
+                            }
+                        ]
+                    }
+                ]
+            },
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                            'md': 4
+                        },
+                        'content': [
+                            {
+                                'component': 'VSwitch',
+                                'props': {
+                                    'model': 'bypass_recognize',
+                                    'label': '下载时跳过媒体识别',
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+]
+
+# 插件配置默认值
+_FORM_DEFAULTS = {
+    "enabled": False,
+    "notify": True,
+    "onlyonce": False,
+    "cron": "*/30 * * * *",
+    "address": "",
+    "include": "",
+    "exclude": "",
+    "proxy": False,
+    "clear": False,
+    "filter": False,
+    "action": "subscribe",
+    "save_path": "",
+    "bypass_recognize": False,
+    "history_max": 1000
+}
+
 
 class RssSubscribe(_PluginBase):
     # 插件名称
@@ -67,6 +367,8 @@ class RssSubscribe(_PluginBase):
     _clearflag: bool = False
     _action: str = "subscribe"
     _save_path: str = ""
+    _bypass_recognize: bool = False
+    _history_max: int = 1000
 
     def init_plugin(self, config: dict = None):
         self.rsshelper = RssHelper()
@@ -91,6 +393,14 @@ class RssSubscribe(_PluginBase):
             self._clear = config.get("clear")
             self._action = config.get("action")
             self._save_path = config.get("save_path")
+            self._bypass_recognize = config.get("bypass_recognize")
+            try:
+                self._history_max = int(config.get("history_max", 1000) or 0)
+            except ValueError:
+                self._history_max = -1
+            if self._history_max < 0:
+                logger.error(f"历史记录上限配置错误：{config.get('history_max')}，不限制记录条数")
+                self._history_max = 0
 
         if self._onlyonce:
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
@@ -178,256 +488,7 @@ class RssSubscribe(_PluginBase):
         """
         拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
         """
-        return [
-            {
-                'component': 'VForm',
-                'content': [
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'enabled',
-                                            'label': '启用插件',
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'notify',
-                                            'label': '发送通知',
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'onlyonce',
-                                            'label': '立即运行一次',
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'cron',
-                                            'label': '执行周期',
-                                            'placeholder': '5位cron表达式，留空自动'
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSelect',
-                                        'props': {
-                                            'model': 'action',
-                                            'label': '动作',
-                                            'items': [
-                                                {'title': '订阅', 'value': 'subscribe'},
-                                                {'title': '下载', 'value': 'download'}
-                                            ]
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextarea',
-                                        'props': {
-                                            'model': 'address',
-                                            'label': 'RSS地址',
-                                            'rows': 3,
-                                            'placeholder': '每行一个RSS地址'
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'include',
-                                            'label': '包含',
-                                            'placeholder': '支持正则表达式'
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'exclude',
-                                            'label': '排除',
-                                            'placeholder': '支持正则表达式'
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'save_path',
-                                            'label': '保存目录',
-                                            'placeholder': '下载时有效，留空自动'
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'proxy',
-                                            'label': '使用代理服务器',
-                                        }
-                                    }
-                                ]
-                            }, {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'filter',
-                                            'label': '使用过滤规则',
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 4
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'clear',
-                                            'label': '清理历史记录',
-                                        }
-                                    }
-                                ]
-                            }
-                        ]
-                    }
-                ]
-            }
-        ], {
-            "enabled": False,
-            "notify": True,
-            "onlyonce": False,
-            "cron": "*/30 * * * *",
-            "address": "",
-            "include": "",
-            "exclude": "",
-            "proxy": False,
-            "clear": False,
-            "filter": False,
-            "action": "subscribe",
-            "save_path": ""
-        }
+        return _FORM_SCHEMA, dict(_FORM_DEFAULTS)
 
     def get_page(self) -> List[dict]:
         """
@@ -446,15 +507,14 @@ class RssSubscribe(_PluginBase):
                 }
             ]
         # 数据按时间降序排序
-        historys = sorted(historys, key=lambda x: x.get('time'), reverse=True)
+        historys = sorted(historys, key=itemgetter('time'), reverse=True)
+        # 只取展示需要的字段
+        historys = [HistoryRec._make(map(h.get, HistoryRec._fields)) for h in historys]
         # 拼装页面
         contents = []
-        for history in historys:
-            title = history.get("title")
-            poster = history.get("poster")
-            mtype = history.get("type")
-            time_str = history.get("time")
-            contents.append(
+        append = contents.append
+        for title, poster, mtype, time_str in historys:
+            append(
                 {
                     'component': 'VCard',
                     'content': [
@@ -561,9 +621,13 @@ class RssSubscribe(_PluginBase):
         historys = self.get_data('history')
         if not historys:
             return schemas.Response(success=False, message="未找到历史记录")
-        # 删除指定记录
+        # 删除指定记录，对应的资源可重新处理
+        removed_keys = {h.get("key") for h in historys if h.get("title") == key}
         historys = [h for h in historys if h.get("title") != key]
         self.save_data('history', historys)
+        processed_keys = self.get_data('processed_keys')
+        if processed_keys is not None:
+            self.save_data('processed_keys', [k for k in processed_keys if k not in removed_keys])
         return schemas.Response(success=True, message="删除成功")
 
     def __update_config(self):
@@ -582,36 +646,141 @@ class RssSubscribe(_PluginBase):
             "clear": self._clear,
             "filter": self._filter,
             "action": self._action,
-            "save_path": self._save_path
+            "save_path": self._save_path,
+            "bypass_recognize": self._bypass_recognize,
+            "history_max": self._history_max
         })
 
+    @staticmethod
+    def __compile_rule(pattern: str, cache: Dict[str, re.Pattern]) -> Optional[re.Pattern]:
+        """
+        编译正则规则，相同规则只编译一次
+        """
+        if not pattern:
+            return None
+        regex = cache.get(pattern)
+        if regex is None:
+            regex = re.compile(pattern, re.IGNORECASE)
+            cache[pattern] = regex
+        return regex
+
+    @staticmethod
+    def __query_get(query: str, key: str, default: str) -> str:
+        """
+        获取URL查询参数的第一个非空值，未配置时返回默认值
+        """
+        prefix = f"{key}="
+        for param in query.split("&"):
+            if param.startswith(prefix) and len(param) > len(prefix):
+                return urllib.parse.unquote_plus(param[len(prefix):])
+        return default
+
+    @staticmethod
+    def __get_poster(mediainfo: MediaInfo, cache: Dict[int, str]) -> Optional[str]:
+        """
+        获取海报地址，按TMDBID缓存
+        """
+        if not mediainfo.tmdb_id:
+            return mediainfo.get_poster_image()
+        poster = cache.get(mediainfo.tmdb_id)
+        if poster is None:
+            poster = mediainfo.get_poster_image()
+            cache[mediainfo.tmdb_id] = poster
+        return poster
+
+    def __fetch_rss(self, url: str) -> Optional[List[dict]]:
+        """
+        获取RSS数据，在线程池中执行
+        """
+        logger.info(f"开始刷新RSS：{url} ...")
+        try:
+            return self.rsshelper.parse(url, proxy=self._proxy)
+        except Exception as err:
+            logger.error(f"获取RSS数据出错：{url} - {str(err)}")
+            return None
+
+    def __fetch_feeds(self, feeds: List[tuple]) -> Iterator[Tuple[tuple, Optional[List[dict]]]]:
+        """
+        并发获取多个RSS链接的数据，按获取完成的先后顺序返回
+        """
+        if not feeds:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(feeds))) as executor:
+            futures = {executor.submit(self.__fetch_rss, feed[0]): feed for feed in feeds}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
     def check(self):
         """
         通过用户RSS同步豆瓣想看数据
         """
         if not self._address:
             return
-        # 读取历史记录
-        if self._clearflag:
-            history = []
-        else:
-            history: List[dict] = self.get_data('history') or []
-        for url in self._address.split("\n"):
-            parsed_url = urllib.parse.urlparse(url)
-            query_params = urllib.parse.parse_qs(parsed_url.query)
-
-            url_include = query_params.get('include', [self._include])[0]
-            url_exclude = query_params.get('exclude', [self._exclude])[0]
-            # 处理每一个RSS链接
-            if not url:
+        # 去除空行和重复的RSS链接，保持原有顺序
+        urls = list(dict.fromkeys(u.strip() for u in self._address.splitlines() if u.strip()))
+        # 预编译包含/排除规则，规则无效时不处理RSS，但仍需保存/清理历史记录
+        regex_cache: Dict[str, re.Pattern] = {}
+        try:
+            include_re = self.__compile_rule(self._include, regex_cache)
+            exclude_re = self.__compile_rule(self._exclude, regex_cache)
+        except re.error as err:
+            logger.error(f"包含/排除规则不是有效的正则表达式：{str(err)}")
+            include_re = exclude_re = None
+            urls = []
+        # 读取历史记录，超出上限时丢弃最早的记录
+        history: Deque[dict] = deque(maxlen=self._history_max or None)
+        # 已处理过的标题，单独保存，不受历史记录上限影响
+        processed_keys: List[str] = []
+        if not self._clearflag:
+            saved_history = self.get_data('history') or []
+            processed_keys = self.get_data('processed_keys')
+            if processed_keys is None:
+                # 兼容未单独保存标题的旧数据
+                processed_keys = [h.get("key") for h in saved_history]
+            history.extend(saved_history)
+        seen_keys = set(processed_keys)
+        # 本次新增的历史记录，使用同一个处理时间
+        new_entries: List[dict] = []
+        run_ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # 直接下载且不使用过滤规则时，可跳过媒体识别和媒体库检查
+        bypass = self._bypass_recognize and self._action == "download" and not self._filter
+        # 本次运行的媒体识别结果，同一媒体的不同资源只识别一次
+        recog_cache: Dict[tuple, Optional[MediaInfo]] = {}
+        # 本次运行的海报地址，TMDBID -> 海报地址
+        poster_cache: Dict[int, str] = {}
+        # 本次运行的订阅检查结果，同一媒体同一季只查询一次
+        subscribed: Dict[tuple, bool] = {}
+        # 过滤规则
+        filter_rule = self.systemconfig.get(SystemConfigKey.SubscribeFilterRules)
+        # 解析每一个RSS链接的独立规则
+        feeds = []
+        for url in urls:
+            # 独立规则，未配置时使用全局规则
+            url_include, url_exclude = self._include, self._exclude
+            if '?' in url:
+                query = urllib.parse.urlparse(url).query
+                url_include = self.__query_get(query, 'include', url_include)
+                url_exclude = self.__query_get(query, 'exclude', url_exclude)
+            try:
+                url_include_re = self.__compile_rule(url_include, regex_cache)
+                url_exclude_re = self.__compile_rule(url_exclude, regex_cache)
+            except re.error as err:
+                logger.error(f"RSS {url} 独立规则不是有效的正则表达式：{str(err)}")
                 continue
-            logger.info(f"开始刷新RSS：{url} ...")
-            results = self.rsshelper.parse(url, proxy=self._proxy)
+            # 与全局规则相同时无需重复检查
+            if url_include_re is include_re:
+                url_include_re = None
+            if url_exclude_re is exclude_re:
+                url_exclude_re = None
+            feeds.append((url, url_include_re, url_exclude_re))
+        # 并发获取RSS数据，先获取到的先处理，识别和订阅仍在当前线程中串行处理
+        for (url, url_include_re, url_exclude_re), results in self.__fetch_feeds(feeds):
+            # 处理每一个RSS链接
             if not results:
                 logger.error(f"未获取到RSS数据：{url}")
-                return
-            # 过滤规则
-            filter_rule = self.systemconfig.get(SystemConfigKey.SubscribeFilterRules)
+                continue
+            # 处理出错的条目，每个RSS链接只输出一次汇总
+            fail_count, first_err = 0, None
             # 解析数据
             for result in results:
                 try:
@@ -622,45 +791,55 @@ class RssSubscribe(_PluginBase):
                     size = result.get("size")
                     pubdate: datetime.datetime = result.get("pubdate")
                     # 检查是否处理过
-                    if not title or title in [h.get("key") for h in history]:
+                    if not title or title in seen_keys:
                         continue
                     # 检查所有规则
-                    if self._include and not re.search(r"%s" % self._include,
-                                                       f"{title} {description}", re.IGNORECASE):
-                        logger.info(f"{title} - {description} 不符合包含规则")
+                    haystack = f"{title} {description}"
+                    if include_re and not include_re.search(haystack):
+                        logger.info("%s - %s 不符合包含规则", title, description)
                         continue
-                    if self._exclude and re.search(r"%s" % self._exclude,
-                                                   f"{title} {description}", re.IGNORECASE):
-                        logger.info(f"{title} - {description} 不符合排除规则")
+                    if exclude_re and exclude_re.search(haystack):
+                        logger.info("%s - %s 不符合排除规则", title, description)
                         continue
                     # 检查独立规则
-                    if url_include and not re.search(r"%s" % url_include,
-                                                    f"{title} {description}", re.IGNORECASE):
-                        logger.info(f"{title} - {description} 不符合包含规则")
+                    if url_include_re and not url_include_re.search(haystack):
+                        logger.info("%s - %s 不符合包含规则", title, description)
                         continue
-                    if url_exclude and re.search(r"%s" % url_exclude,
-                                                f"{title} {description}", re.IGNORECASE):
-                        logger.info(f"{title} - {description} 不符合排除规则")
+                    if url_exclude_re and url_exclude_re.search(haystack):
+                        logger.info("%s - %s 不符合排除规则", title, description)
                         continue
                     # 识别媒体信息
                     meta = MetaInfo(title=title, subtitle=description)
                     if not meta.name:
-                        logger.warn(f"{title} 未识别到有效数据")
+                        logger.warn("%s 未识别到有效数据", title)
                         continue
-                    mediainfo: MediaInfo = self.chain.recognize_media(meta=meta)
+                    recog_key = (meta.name, meta.year, meta.type, meta.begin_season)
+                    if bypass:
+                        mediainfo: MediaInfo = MediaInfo(type=meta.type, title=meta.name, year=meta.year)
+                    elif recog_key in recog_cache:
+                        mediainfo: MediaInfo = recog_cache[recog_key]
+                    else:
+                        mediainfo: MediaInfo = self.chain.recognize_media(meta=meta)
+                        recog_cache[recog_key] = mediainfo
                     if not mediainfo:
-                        logger.warn(f'未识别到媒体信息，标题：{title}')
+                        logger.warn('未识别到媒体信息，标题：%s', title)
                         continue
-                    # 种子
-                    torrentinfo = TorrentInfo(
-                        title=title,
-                        description=description,
-                        enclosure=enclosure,
-                        page_url=link,
-                        size=size,
-                        pubdate=pubdate.strftime("%Y-%m-%d %H:%M:%S") if pubdate else None,
-                        site_proxy=self._proxy,
-                    )
+                    media_title, media_year, media_type, tmdbid = \
+                        mediainfo.title, mediainfo.year, mediainfo.type, mediainfo.tmdb_id
+                    season, begin_season = meta.season, meta.begin_season
+                    mtype_value = media_type.value if media_type else ''
+                    # 种子，仅过滤和下载时需要
+                    torrentinfo = None
+                    if self._filter or self._action == "download":
+                        torrentinfo = TorrentInfo(
+                            title=title,
+                            description=description,
+                            enclosure=enclosure,
+                            page_url=link,
+                            size=size,
+                            pubdate=pubdate.strftime("%Y-%m-%d %H:%M:%S") if pubdate else None,
+                            site_proxy=self._proxy,
+                        )
                     # 过滤种子
                     if self._filter:
                         result = self.chain.filter_torrents(
@@ -669,25 +848,28 @@ class RssSubscribe(_PluginBase):
                             mediainfo=mediainfo
                         )
                         if not result:
-                            logger.info(f"{title} {description} 不匹配过滤规则")
+                            logger.info("%s %s 不匹配过滤规则", title, description)
                             continue
                     # 查询缺失的媒体信息
-                    exist_flag, no_exists = self.downloadchain.get_no_exists_info(meta=meta, mediainfo=mediainfo)
+                    if bypass:
+                        exist_flag, no_exists = False, {}
+                    else:
+                        exist_flag, no_exists = self.downloadchain.get_no_exists_info(meta=meta, mediainfo=mediainfo)
                     if exist_flag:
-                        logger.info(f'{mediainfo.title_year} 媒体库中已存在')
+                        logger.info('%s 媒体库中已存在', mediainfo.title_year)
                         continue
                     else:
                         if self._action == "download":
-                            if mediainfo.type == MediaType.TV:
+                            if media_type == MediaType.TV:
                                 if no_exists:
-                                    exist_info = no_exists.get(mediainfo.tmdb_id)
-                                    season_info = exist_info.get(meta.begin_season or 1)
+                                    exist_info = no_exists.get(tmdbid)
+                                    season_info = exist_info.get(begin_season or 1)
                                     if not season_info:
-                                        logger.info(f'{mediainfo.title_year} {meta.season} 己存在')
+                                        logger.info('%s %s 己存在', mediainfo.title_year, season)
                                         continue
                                     if (season_info.episodes
                                             and not set(meta.episode_list).issubset(set(season_info.episodes))):
-                                        logger.info(f'{mediainfo.title_year} {meta.season_episode} 己存在')
+                                        logger.info('%s %s 己存在', mediainfo.title_year, meta.season_episode)
                                         continue
                             # 添加下载
                             result = self.downloadchain.download_single(
@@ -700,37 +882,51 @@ class RssSubscribe(_PluginBase):
                                 username="RSS订阅"
                             )
                             if not result:
-                                logger.error(f'{title} 下载失败')
+                                logger.error('%s 下载失败', title)
                                 continue
                         else:
                             # 检查是否在订阅中
-                            subflag = self.subscribechain.exists(mediainfo=mediainfo, meta=meta)
+                            sub_key = (tmdbid, mediainfo.douban_id, begin_season)
+                            subflag = subscribed.get(sub_key)
+                            if subflag is None:
+                                subflag = self.subscribechain.exists(mediainfo=mediainfo, meta=meta)
+                                subscribed[sub_key] = subflag
                             if subflag:
-                                logger.info(f'{mediainfo.title_year} {meta.season} 正在订阅中')
+                                logger.info('%s %s 正在订阅中', mediainfo.title_year, season)
                                 continue
                             # 添加订阅
-                            self.subscribechain.add(title=mediainfo.title,
-                                                    year=mediainfo.year,
-                                                    mtype=mediainfo.type,
-                                                    tmdbid=mediainfo.tmdb_id,
-                                                    season=meta.begin_season,
+                            self.subscribechain.add(title=media_title,
+                                                    year=media_year,
+                                                    mtype=media_type,
+                                                    tmdbid=tmdbid,
+                                                    season=begin_season,
                                                     exist_ok=True,
                                                     username="RSS订阅")
+                            subscribed[sub_key] = True
                     # 存储历史记录
-                    history.append({
-                        "title": f"{mediainfo.title} {meta.season}",
-                        "key": f"{title}",
-                        "type": mediainfo.type.value,
-                        "year": mediainfo.year,
-                        "poster": mediainfo.get_poster_image(),
+                    new_entries.append({
+                        "title": f"{media_title} {season}" if season else media_title,
+                        "key": title,
+                        "type": mtype_value,
+                        "year": media_year,
+                        "poster": self.__get_poster(mediainfo, poster_cache),
                         "overview": mediainfo.overview,
-                        "tmdbid": mediainfo.tmdb_id,
-                        "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        "tmdbid": tmdbid,
+                        "time": run_ts
                     })
+                    seen_keys.add(title)
                 except Exception as err:
-                    logger.error(f'刷新RSS数据出错：{str(err)} - {traceback.format_exc()}')
-            logger.info(f"RSS {url} 刷新完成")
-        # 保存历史记录
-        self.save_data('history', history)
+                    fail_count += 1
+                    if first_err is None:
+                        first_err = err
+                        logger.debug('刷新RSS数据出错：%s', err, exc_info=True)
+            if fail_count:
+                logger.warn('RSS %s 共 %s 条数据处理出错，首个错误：%s', url, fail_count, first_err)
+            logger.info("RSS %s 刷新完成", url)
+        # 保存历史记录，有变化时才写入
+        if new_entries or self._clearflag:
+            history.extend(new_entries)
+            self.save_data('history', list(history))
+            self.save_data('processed_keys', processed_keys + [h.get("key") for h in new_entries])
         # 缓存只清理一次
         self._clearflag = False